@@ -1,7 +1,11 @@
 import os
+import re
 import sys
+import argparse
+import hashlib
 import subprocess
-import importlib.util
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor
 
 REQUIRED = {
     'yt_dlp': 'yt_dlp',
@@ -16,67 +20,237 @@ REQUIRED = {
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.abspath(os.path.join(BASE_DIR, '..', '..'))
+DEPS_MARKER = os.path.join(BASE_DIR, '.deps_ok')
+DIST_DIR = os.path.join(ROOT_DIR, 'dist')
+DEFAULT_SCRIPTS = ['scripts/main_windows_strict.py']
+DEFAULT_DATA = ['ico', 'system']
+DEFAULT_ICON = 'ico/eye-Normal-State.ico'
+# Written by the scripts at runtime; neither bundled nor part of the build key
+RUNTIME_NAMES = {
+    'config.json', 'config.ini', 'download-list.txt', 'script.log', 'script.lock',
+}
+# Comment appended to generated specs to remember their --data/--icon
+SPEC_OPTIONS_PREFIX = '# build_exe options: '
 os.chdir(ROOT_DIR)
 
 
+def _requirements_key() -> str:
+    """Return a hash identifying the requirement set and interpreter."""
+    data = repr((sorted(REQUIRED.items()), sys.executable, sys.platform))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _write_marker(key: str) -> None:
+    try:
+        with open(DEPS_MARKER, 'w', encoding='utf-8') as f:
+            f.write(key)
+    except OSError:
+        pass
+
+
+def _normalize(name: str) -> str:
+    """Normalize a distribution name as described in PEP 503."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def _installed_distributions() -> set[str]:
+    """Return normalized names of all installed distributions."""
+    names = set()
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            names.add(_normalize(name))
+    return names
+
+
 def check_packages() -> bool:
-    """Install missing dependencies."""
-    installed_new = False
-    for module, package in REQUIRED.items():
+    """Install missing dependencies with a single pip invocation.
+
+    A successful check is remembered in ``.deps_ok`` so later runs with the
+    same requirements and interpreter skip the lookup entirely.
+    """
+    key = _requirements_key()
+    try:
+        with open(DEPS_MARKER, encoding='utf-8') as f:
+            if f.read() == key:
+                print('All packages already present.')
+                return True
+    except OSError:
+        pass
+
+    installed = _installed_distributions()
+    missing = []
+    for package in REQUIRED.values():
         if package == 'pywin32' and not sys.platform.startswith('win'):
             continue
-        if importlib.util.find_spec(module) is None:
-            print(f"Installing {package}...")
-            try:
-                subprocess.check_call([
-                    sys.executable,
-                    '-m', 'pip', 'install', '--quiet', '--disable-pip-version-check',
-                    package,
-                ])
-                installed_new = True
-            except subprocess.CalledProcessError:
-                return False
-    if installed_new:
-        print('All packages installed.')
-    else:
+        if _normalize(package) not in installed:
+            missing.append(package)
+    if not missing:
         print('All packages already present.')
+        _write_marker(key)
+        return True
+    print(f"Installing {', '.join(missing)}...")
+    try:
+        subprocess.check_call([
+            sys.executable,
+            '-m', 'pip', 'install', '--quiet', '--disable-pip-version-check',
+            *missing,
+        ])
+    except subprocess.CalledProcessError:
+        return False
+    print('All packages installed.')
+    _write_marker(key)
     return True
 
 
-def compile_sources(paths: list[str]) -> bool:
-    for p in paths:
-        if subprocess.run([sys.executable, '-m', 'py_compile', p]).returncode != 0:
-            return False
-    return True
+def spec_path(script: str) -> str:
+    """Return the ``.spec`` file used to build *script*."""
+    name = os.path.splitext(os.path.basename(script))[0]
+    return os.path.join(ROOT_DIR, f'{name}.spec')
+
+
+def bundled_files(datas: list[str]) -> list[str]:
+    """Return the files under *datas* that go into the executable."""
+    paths = []
+    for data in datas:
+        if os.path.isfile(data):
+            paths.append(data)
+            continue
+        for root, dirs, files in os.walk(data):
+            dirs[:] = sorted(d for d in dirs if d not in RUNTIME_NAMES)
+            paths.extend(
+                os.path.join(root, name) for name in sorted(files)
+                if name not in RUNTIME_NAMES and not name.endswith('.tmp')
+            )
+    return paths
+
+
+def spec_options(datas: list[str], icon: str) -> str:
+    """Return the options a spec is generated from, as stored in the spec.
 
+    The bundled file list is included so that adding or removing a data
+    file regenerates the spec as well.
+    """
+    return repr((bundled_files(datas), icon))
 
-def build_executable(script: str) -> bool:
+
+def recorded_options(spec: str) -> str:
+    """Return the options *spec* was generated with.
+
+    Specs written before the options were recorded, or by hand, are assumed
+    to use the defaults.
+    """
+    with open(spec, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith(SPEC_OPTIONS_PREFIX):
+                return line[len(SPEC_OPTIONS_PREFIX):].strip()
+    return spec_options(DEFAULT_DATA, DEFAULT_ICON)
+
+
+def generate_spec(script: str, datas: list[str], icon: str) -> bool:
+    """Write the PyInstaller spec for *script* via ``pyi-makespec``."""
     sep = ';' if os.name == 'nt' else ':'
     cmd = [
-        'pyinstaller',
-        '--noconfirm',
+        'pyi-makespec',
         '--onefile',
         '--windowed',
-        f'--icon=ico/eye-Normal-State.ico',
-        f'--add-data=ico{sep}ico',
-        f'--add-data=system{sep}system',
+        f'--icon={icon}',
+        *(f'--add-data={path}{sep}{os.path.dirname(path) or "."}' for path in bundled_files(datas)),
+        f'--specpath={ROOT_DIR}',
         script,
     ]
-    return subprocess.run(cmd).returncode == 0
+    if subprocess.run(cmd).returncode != 0:
+        return False
+    with open(spec_path(script), 'a', encoding='utf-8') as f:
+        f.write(f'\n{SPEC_OPTIONS_PREFIX}{spec_options(datas, icon)}\n')
+    return True
+
+
+def build_key(script: str, spec: str, datas: list[str]) -> str:
+    """Hash the sources, bundled data and PyInstaller version of a build."""
+    digest = hashlib.sha256()
+    try:
+        digest.update(importlib.metadata.version('pyinstaller').encode('utf-8'))
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    for path in [script, spec, *bundled_files(datas)]:
+        digest.update(path.encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build_executable(
+    script: str,
+    datas: list[str] = DEFAULT_DATA,
+    icon: str = DEFAULT_ICON,
+) -> bool:
+    """Build *script* from its spec, generating the spec on first use.
+
+    The spec is generated again when *datas* or *icon* differ from the ones
+    it was generated with, otherwise they would be silently ignored.
+
+    The build runs without ``--clean`` so PyInstaller can reuse the analysis
+    cached in ``build/`` from the previous run.  When neither the sources nor
+    the bundled data changed since the last build, PyInstaller is skipped.
+    """
+    spec = spec_path(script)
+    if os.path.exists(spec) and recorded_options(spec) != spec_options(datas, icon):
+        print(f'{os.path.basename(spec)}: --data/--icon changed, regenerating spec.')
+        os.remove(spec)
+    if not os.path.exists(spec) and not generate_spec(script, datas, icon):
+        return False
+
+    name = os.path.splitext(os.path.basename(script))[0]
+    exe = os.path.join(DIST_DIR, name + ('.exe' if os.name == 'nt' else ''))
+    key_file = os.path.join(DIST_DIR, f'.{name}.build_key')
+    key = build_key(script, spec, datas)
+    try:
+        with open(key_file, encoding='utf-8') as f:
+            if f.read() == key and os.path.exists(exe):
+                print(f'{name}: sources unchanged, using cached build.')
+                return True
+    except OSError:
+        pass
+
+    if subprocess.run(['pyinstaller', '--noconfirm', spec]).returncode != 0:
+        return False
+    with open(key_file, 'w', encoding='utf-8') as f:
+        f.write(key)
+    return True
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Check dependencies and build executables.')
+    parser.add_argument(
+        '--entry', action='append', dest='scripts', metavar='PATH',
+        help='script to build, relative to the repository root (repeatable)',
+    )
+    parser.add_argument(
+        '--data', action='append', dest='datas', metavar='PATH',
+        help='file or folder to bundle next to the executable (repeatable)',
+    )
+    parser.add_argument(
+        '--icon', default=DEFAULT_ICON, metavar='PATH', help='icon for the executable',
+    )
+    return parser.parse_args(argv)
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    scripts = args.scripts or DEFAULT_SCRIPTS
+    datas = args.datas or DEFAULT_DATA
     if not check_packages():
         input('Dependency check failed. Press Enter to exit...')
         return
-    scripts = ['scripts/main_windows_strict.py']
-    if not compile_sources(scripts):
-        input('Compilation failed. Press Enter to exit...')
+    # Each build is a separate PyInstaller process, so threads are enough
+    # to run them side by side
+    with ThreadPoolExecutor(max_workers=min(len(scripts), os.cpu_count() or 1)) as pool:
+        results = list(pool.map(lambda sc: build_executable(sc, datas, args.icon), scripts))
+    failed = [sc for sc, ok in zip(scripts, results) if not ok]
+    if failed:
+        input(f"Build failed for {', '.join(failed)}. Press Enter to exit...")
         return
-    for sc in scripts:
-        if not build_executable(sc):
-            input(f'Build failed for {sc}. Press Enter to exit...')
-            return
     input('Build completed successfully. Press Enter to exit...')
 
 
@@ -8,41 +8,49 @@ The script provides two modes of operation:
   purely in the console which is useful for environments without a display
   server. Progress information is printed to stdout.
 
-Settings are stored in ``config.ini`` inside the ``system`` folder and events
+Settings are stored in ``config.json`` inside the ``system`` folder and events
 are logged to ``script.log``.
 """
 
-from typing import List, Dict, Callable
+from typing import TYPE_CHECKING, Dict, Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import os
+import re
 import sys
 import configparser
+import json
+import hashlib
 import threading
 import logging
+import logging.handlers
+import atexit
 import time
+import queue
+import shutil
+import signal
 import subprocess
 
-import yt_dlp
-import pyperclip
-import keyboard
-try:
-    import pystray
-    from PIL import Image
-except Exception:  # When display server is missing
-    pystray = None  # type: ignore
-    Image = None  # type: ignore
 if os.name == 'nt':
+    import ctypes
+    user32 = ctypes.windll.user32
     try:
         import win32con
         import win32api
         import win32gui
+        import win32clipboard
     except Exception:
-        win32con = win32api = win32gui = None  # type: ignore
+        win32con = win32api = win32gui = win32clipboard = None  # type: ignore
 else:
-    win32con = win32api = win32gui = None  # type: ignore
+    user32 = None
+    win32con = win32api = win32gui = win32clipboard = None  # type: ignore
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+if TYPE_CHECKING:
+    import yt_dlp
+
 
 def get_root_dir() -> str:
     if getattr(sys, 'frozen', False):
@@ -53,13 +61,19 @@ def get_root_dir() -> str:
 ROOT_DIR = get_root_dir()
 SYSTEM_DIR = os.path.join(ROOT_DIR, 'system')
 ICO_DIR = os.path.join(ROOT_DIR, 'ico')
-CONFIG_FILE = os.path.join(SYSTEM_DIR, 'config.ini')
+CONFIG_FILE = os.path.join(SYSTEM_DIR, 'config.json')
+# Read once to migrate settings from versions that used configparser
+LEGACY_CONFIG_FILE = os.path.join(SYSTEM_DIR, 'config.ini')
 LOG_FILE = os.path.join(SYSTEM_DIR, 'script.log')
 
 
 # Ensure the system directory exists for logs and config
 os.makedirs(SYSTEM_DIR, exist_ok=True)
 
+XCLIP = shutil.which('xclip') if os.name != 'nt' else None
+URL_PREFIXES = ('http://', 'https://')
+_URL_RE = re.compile(r'https?://\S+')
+
 ICON_DEFAULT = os.path.join(ICO_DIR, 'ico.ico')
 ICON_ACTIVE = os.path.join(ICO_DIR, 'act.ico')
 ICON_DOWNLOAD = os.path.join(ICO_DIR, 'dw.ico')
@@ -68,15 +82,55 @@ BG_COLOR = '#2b2b2b'
 FG_COLOR = '#f0f0f0'
 TEXT_COLOR = '#dddddd'
 PROGRESS_EMPTY = '#555555'
+# Default number of URLs downloaded at the same time in GUI mode
+MAX_PARALLEL_DOWNLOADS = 4
+# Fragments of a single HLS/DASH video fetched at once by yt_dlp
+CONCURRENT_FRAGMENTS = 8
+# Upper bound and sampling period of the adaptive download concurrency
+ADAPTIVE_MAX_PARALLEL = 16
+TUNE_INTERVAL_MS = 2000
+# Samples averaged into one throughput measurement of the tuner
+TUNE_SAMPLES = 3
+# How long to wait for copied text to reach the clipboard and how often to check
+CLIPBOARD_TIMEOUT = 0.5
+CLIPBOARD_POLL_MS = 10
+# Delay between progress redraws in milliseconds (about 30 updates per second)
+PROGRESS_INTERVAL_MS = 33
 
 
 class HotkeyManager:
-    """Cross-platform hotkey registration with fallback to ``keyboard``."""
+    """Cross-platform hotkey registration with fallback to ``keyboard``.
+
+    On Windows hotkeys are registered with ``RegisterHotKey``. The API binds a
+    hotkey to the calling thread, so registration happens on the thread that
+    runs the message loop and ``WM_HOTKEY`` is dispatched from there.
+    """
+
+    # Posted to the loop thread when ``_calls`` has pending work
+    WM_LOOP_CALL = 0x8000 + 1  # WM_APP + 1
+    # Seconds to wait for the loop thread before giving up on a call
+    LOOP_CALL_TIMEOUT = 2
+
+    # Modifier flags and virtual-key codes by lowercase name, e.g. 'space'
+    _MOD_MAP = {
+        'ctrl': win32con.MOD_CONTROL,
+        'alt': win32con.MOD_ALT,
+        'shift': win32con.MOD_SHIFT,
+        'win': win32con.MOD_WIN,
+    } if win32con else {}
+    _VK_MAP = {
+        name[3:].lower(): getattr(win32con, name)
+        for name in dir(win32con) if name.startswith('VK_')
+    } if win32con else {}
 
     def __init__(self) -> None:
         self.ids: dict[int, Callable] = {}
         self._counter = 1
         self._loop_thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._calls: queue.Queue = queue.Queue()
+        self._uses_keyboard = False
 
     def _parse_win(self, combo: str) -> tuple[int, int] | None:
         if not win32con:
@@ -84,19 +138,14 @@ class HotkeyManager:
         mods = 0
         key = None
         for part in combo.lower().split('+'):
-            if part == 'ctrl':
-                mods |= win32con.MOD_CONTROL
-            elif part == 'alt':
-                mods |= win32con.MOD_ALT
-            elif part == 'shift':
-                mods |= win32con.MOD_SHIFT
-            elif part == 'win':
-                mods |= win32con.MOD_WIN
-            else:
+            mod = self._MOD_MAP.get(part)
+            if mod is None:
                 key = part
+            else:
+                mods |= mod
         if key is None:
             return None
-        vk = getattr(win32con, f'VK_{key.upper()}', None)
+        vk = self._VK_MAP.get(key)
         if vk is None:
             if len(key) == 1:
                 vk = ord(key.upper())
@@ -105,47 +154,100 @@ class HotkeyManager:
         return mods, vk
 
     def _run_loop(self) -> None:
-        if not win32gui:
-            return
+        self._thread_id = win32api.GetCurrentThreadId()
+        # Make sure the thread has a message queue before others post to it
+        win32gui.PeekMessage(None, 0, 0, win32con.PM_NOREMOVE)
+        self._ready.set()
         while True:
-            msg = win32gui.GetMessage(None, 0, 0)
-            if not msg:
+            rc, msg = win32gui.GetMessage(None, 0, 0)
+            if rc <= 0:
                 break
-            if msg[1][1] == win32con.WM_HOTKEY:
-                hot_id = msg[1][2]
-                cb = self.ids.get(hot_id)
+            if msg[1] == win32con.WM_HOTKEY:
+                cb = self.ids.get(msg[2])
                 if cb:
-                    cb()
-            win32gui.TranslateMessage(msg[1])
-            win32gui.DispatchMessage(msg[1])
+                    try:
+                        cb()
+                    except Exception as e:
+                        logging.error('Hotkey callback failed: %s', e)
+            elif msg[1] == self.WM_LOOP_CALL:
+                while not self._calls.empty():
+                    func, result, done = self._calls.get()
+                    try:
+                        result.append(func())
+                    except Exception as e:
+                        logging.error('Win32 hotkey failed: %s', e)
+                        result.append(False)
+                    done.set()
+            win32gui.TranslateMessage(msg)
+            win32gui.DispatchMessage(msg)
+
+    def _call_in_loop(self, func: Callable):
+        """Run *func* on the message loop thread and return its result.
+
+        ``None`` is returned when the loop thread has exited or does not
+        answer within ``LOOP_CALL_TIMEOUT`` seconds.
+        """
+        if not self._loop_thread:
+            self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
+            self._loop_thread.start()
+        if threading.current_thread() is self._loop_thread:
+            return func()
+        if not self._ready.wait(self.LOOP_CALL_TIMEOUT) or not self._loop_thread.is_alive():
+            return None
+        result: list = []
+        done = threading.Event()
+        self._calls.put((func, result, done))
+        win32api.PostThreadMessage(self._thread_id, self.WM_LOOP_CALL, 0, 0)
+        if not done.wait(self.LOOP_CALL_TIMEOUT):
+            logging.error('Hotkey message loop did not respond')
+            return None
+        return result[0]
 
     def register(self, combo: str, callback: Callable) -> None:
-        if os.name == 'nt' and win32api:
+        if user32 and win32gui:
             parsed = self._parse_win(combo)
             if parsed:
                 mods, vk = parsed
                 hot_id = self._counter
                 self._counter += 1
-                try:
-                    if win32api.RegisterHotKey(None, hot_id, mods, vk):
-                        self.ids[hot_id] = callback
-                        if not self._loop_thread:
-                            self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
-                            self._loop_thread.start()
-                        return
-                except Exception as e:
-                    logging.error('Win32 hotkey failed: %s', e)
+                if self._call_in_loop(lambda: user32.RegisterHotKey(None, hot_id, mods, vk)):
+                    self.ids[hot_id] = callback
+                    return
+                logging.error('Win32 hotkey failed: %s', combo)
+        import keyboard
+
+        self._uses_keyboard = True
         keyboard.add_hotkey(combo, callback, suppress=True, trigger_on_release=True)
 
     def unregister_all(self) -> None:
-        if os.name == 'nt' and win32api:
-            for hot_id in list(self.ids):
-                try:
-                    win32api.UnregisterHotKey(None, hot_id)
-                except Exception:
-                    pass
+        if self.ids:
+            hot_ids = list(self.ids)
+            self.ids.clear()
+            self._call_in_loop(lambda: [user32.UnregisterHotKey(None, i) for i in hot_ids])
+        if self._uses_keyboard:
+            import keyboard
+
+            keyboard.unhook_all_hotkeys()
+            self._uses_keyboard = False
+
+    def shutdown(self) -> None:
+        """Unregister all hotkeys and stop the message loop thread.
+
+        ``WM_QUIT`` makes the blocking ``GetMessage`` return 0, so the thread
+        exits right away instead of lingering until the process dies.
+        """
+        thread = self._loop_thread
+        if thread is not None and not thread.is_alive():
+            # Hotkeys die with their thread, only the keyboard hooks are left
             self.ids.clear()
-        keyboard.unhook_all_hotkeys()
+        self.unregister_all()
+        if thread is None:
+            return
+        if thread.is_alive():
+            win32api.PostThreadMessage(self._thread_id, win32con.WM_QUIT, 0, 0)
+            thread.join(timeout=1)
+        self._loop_thread = None
+        self._ready.clear()
 
 
 hotkey_manager = HotkeyManager()
@@ -162,69 +264,329 @@ def resource_path(*parts: str) -> str:
 DEFAULT_CONFIG = {
     'download_path': os.path.join(ROOT_DIR, 'Downloads'),
     'add_hotkey': 'ctrl+space',
-    'download_hotkey': 'ctrl+shift+space'
+    'download_hotkey': 'ctrl+shift+space',
+    'max_parallel': str(MAX_PARALLEL_DOWNLOADS),
+    'concurrent_fragments': str(CONCURRENT_FRAGMENTS),
+    'adaptive_parallel': 'yes',
 }
-
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+# Keys the GUI writes back on "Apply"
+SAVED_KEYS = (
+    'add_hotkey',
+    'download_hotkey',
+    'max_parallel',
+    'concurrent_fragments',
+    'adaptive_parallel',
 )
-logging.getLogger().addHandler(logging.StreamHandler(sys.stdout))
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route log records through a queue to the file and stdout handlers.
+
+    Callers only enqueue records; formatting and I/O happen on the listener
+    thread so logging never stalls the Tk loop or the download workers.
+    """
+    file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
+    file_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, logging.StreamHandler(sys.stdout)
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+setup_logging()
+
+
+# Parsed configuration keyed by the file's modification time and size
+_CFG_CACHE: dict = {}
+# Hash of config.json as last read or written, keyed the same way
+_CFG_DIGEST: dict = {}
+
+
+def _write_config(data: Dict[str, str]) -> bool:
+    """Write *data* to ``config.json`` atomically.
+
+    Returns ``False`` without touching the file when its content would not
+    change.
+    """
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    digest = hashlib.blake2b(text.encode('utf-8')).digest()
+    try:
+        st = os.stat(CONFIG_FILE)
+        key = (st.st_mtime_ns, st.st_size)
+        if _CFG_DIGEST.get('key') != key:
+            with open(CONFIG_FILE, encoding='utf-8') as f:
+                _CFG_DIGEST['digest'] = hashlib.blake2b(f.read().encode('utf-8')).digest()
+            _CFG_DIGEST['key'] = key
+        if _CFG_DIGEST['digest'] == digest:
+            return False
+    except OSError:
+        pass
+    # Write to a temporary file first so a crash never leaves a truncated config
+    tmp = CONFIG_FILE + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, CONFIG_FILE)
+    st = os.stat(CONFIG_FILE)
+    _CFG_DIGEST['key'] = (st.st_mtime_ns, st.st_size)
+    _CFG_DIGEST['digest'] = digest
+    return True
+
+
+def _migrate_ini() -> None:
+    """Convert the settings of an old ``config.ini`` to ``config.json`` once."""
+    parser = configparser.ConfigParser()
+    try:
+        if not parser.read(LEGACY_CONFIG_FILE, encoding='utf-8'):
+            return
+        data = {k: v for section in parser.sections() for k, v in parser.items(section)}
+        _write_config(data)
+    except Exception as e:
+        logging.error('Failed to migrate %s: %s', LEGACY_CONFIG_FILE, e)
+        return
+    logging.info('Migrated %s to %s', LEGACY_CONFIG_FILE, CONFIG_FILE)
+
+
+def _read_config() -> Dict[str, str]:
+    with open(CONFIG_FILE, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError('expected a JSON object')
+    return data
 
 
 def load_config() -> Dict[str, str]:
-    """Return configuration dictionary merging defaults with ``config.ini``.
+    """Return configuration dictionary merging defaults with ``config.json``.
 
     If the file is missing or broken the default configuration is returned and
-    the error is logged.
+    the error is logged. The parsed result is cached until the file changes.
     """
-    parser = configparser.ConfigParser()
-    if parser.read(CONFIG_FILE, encoding='utf-8'):
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
+        _migrate_ini()
         try:
-            data = dict(parser.items('hotkeys'))
-            cfg = {**DEFAULT_CONFIG, **data}
-            return cfg
-        except Exception as e:
-            logging.error('Failed to parse config: %s', e)
-    return DEFAULT_CONFIG.copy()
+            st = os.stat(CONFIG_FILE)
+        except OSError:
+            return DEFAULT_CONFIG.copy()
+    except OSError:
+        return DEFAULT_CONFIG.copy()
+    key = (st.st_mtime_ns, st.st_size)
+    if _CFG_CACHE.get('key') == key:
+        return _CFG_CACHE['val'].copy()
+
+    try:
+        data = _read_config()
+    except (OSError, ValueError) as e:
+        logging.error('Failed to parse config: %s', e)
+        return DEFAULT_CONFIG.copy()
+    # Values are kept as strings, as they were in config.ini
+    cfg = {**DEFAULT_CONFIG, **{k: str(v) for k, v in data.items()}}
+    _CFG_CACHE['key'] = key
+    _CFG_CACHE['val'] = cfg
+    return cfg.copy()
 
 
 def save_config(cfg: Dict[str, str]) -> None:
-    """Write configuration dictionary to ``config.ini``."""
-    parser = configparser.ConfigParser()
-    parser['hotkeys'] = {
-        'add_hotkey': cfg.get('add_hotkey', DEFAULT_CONFIG['add_hotkey']),
-        'download_hotkey': cfg.get('download_hotkey', DEFAULT_CONFIG['download_hotkey'])
-    }
+    """Write the GUI settings to ``config.json`` and refresh the cache.
+
+    Keys written by ``main_windows_strict.py`` are preserved.
+    """
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            parser.write(f)
+        data = _read_config()
+    except (OSError, ValueError):
+        data = {}
+    data.update({key: str(cfg.get(key, DEFAULT_CONFIG[key])) for key in SAVED_KEYS})
+    try:
+        if not _write_config(data):
+            return
+        # Seed the cache so the next load_config() does not parse the file again
+        st = os.stat(CONFIG_FILE)
+        _CFG_CACHE['key'] = (st.st_mtime_ns, st.st_size)
+        _CFG_CACHE['val'] = {**DEFAULT_CONFIG, **{k: str(v) for k, v in data.items()}}
     except Exception as e:
         logging.error('Failed to save config: %s', e)
 
 
+def _positive_int(cfg: Dict[str, str], key: str, default: int) -> int:
+    try:
+        return max(1, int(cfg.get(key, default)))
+    except ValueError:
+        logging.error('Invalid %s value: %s', key, cfg.get(key))
+        return default
+
+
+def get_max_parallel(cfg: Dict[str, str]) -> int:
+    """Return the ``max_parallel`` setting as a positive integer."""
+    return _positive_int(cfg, 'max_parallel', MAX_PARALLEL_DOWNLOADS)
+
+
+def get_concurrent_fragments(cfg: Dict[str, str]) -> int:
+    """Return the ``concurrent_fragments`` setting as a positive integer."""
+    return _positive_int(cfg, 'concurrent_fragments', CONCURRENT_FRAGMENTS)
+
+
+def is_adaptive(cfg: Dict[str, str]) -> bool:
+    """Return ``True`` if the GUI may tune the number of parallel downloads."""
+    value = cfg.get('adaptive_parallel', DEFAULT_CONFIG['adaptive_parallel'])
+    return value.strip().lower() in ('1', 'yes', 'true', 'on')
+
+
+def read_selection() -> str | None:
+    """Return the currently selected text without using the clipboard.
+
+    Only X11 exposes the selection directly (``PRIMARY``). ``None`` means the
+    selection is unavailable and callers should copy it with ``Ctrl+C``.
+    """
+    if not XCLIP or not os.environ.get('DISPLAY'):
+        return None
+    try:
+        result = subprocess.run(
+            [XCLIP, '-o', '-selection', 'primary'],
+            capture_output=True, timeout=1,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('utf-8', errors='replace')
+
+
+def clipboard_text() -> str:
+    """Return the text currently on the clipboard or an empty string.
+
+    On Windows the clipboard is read with a single ``GetClipboardData`` call;
+    elsewhere ``pyperclip`` picks the available backend.
+    """
+    if win32clipboard:
+        try:
+            win32clipboard.OpenClipboard()
+        except Exception:  # Another application holds the clipboard
+            return ''
+        try:
+            return win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
+        except TypeError:  # No text on the clipboard
+            return ''
+        finally:
+            win32clipboard.CloseClipboard()
+    import pyperclip
+
+    return pyperclip.paste()
+
+
 def ensure_download_dir(path: str) -> None:
     """Create download directory if it does not exist."""
     os.makedirs(path, exist_ok=True)
 
 
-def download_url(url: str, folder: str, progress_callback: Callable | None = None) -> None:
+OUTTMPL = '%(title)s.%(ext)s'
+_BASE_YDL_OPTS = {
+    'format': 'best',
+    'merge_output_format': 'mp4',
+    'quiet': True,
+    # Start on playlist entries as they are listed instead of after the
+    # whole playlist page has been fetched
+    'lazy_playlist': True,
+    # Request plain HTTP downloads in 10 MiB ranges, which avoids the
+    # per-connection throttling some CDNs apply to long transfers
+    'http_chunk_size': 10 * 1024 * 1024,
+}
+# aria2c fetches HLS fragments over several connections when installed
+ARIA2C = shutil.which('aria2c')
+if ARIA2C:
+    _BASE_YDL_OPTS['external_downloader'] = {'m3u8': 'aria2c'}
+    _BASE_YDL_OPTS['external_downloader_args'] = {
+        'aria2c': ['-x', '16', '-s', '16', '-k', '1M'],
+    }
+
+
+def is_url(text: str) -> bool:
+    """Return ``True`` if *text* is a single http(s) URL."""
+    # The prefix check rejects most clipboard noise before the regex runs
+    return text.startswith(URL_PREFIXES) and _URL_RE.fullmatch(text) is not None
+
+
+def preload_yt_dlp() -> None:
+    """Import ``yt_dlp`` ahead of the first download."""
+    try:
+        import yt_dlp  # noqa: F401
+    except Exception as e:
+        logging.error('Failed to import yt_dlp: %s', e)
+
+
+class ProgressRelay:
+    """``yt_dlp`` progress hook passing the current download index along.
+
+    With ``concurrent_fragment_downloads`` above one, ``yt_dlp`` calls hooks
+    from its own fragment threads, so the index is kept on the relay of each
+    ``YoutubeDL`` instead of in thread-local state.
+    """
+
+    def __init__(self, callback: Callable[[int, dict], None]) -> None:
+        self.callback = callback
+        self.idx = 0
+
+    def __call__(self, d: dict) -> None:
+        self.callback(self.idx, d)
+
+
+def create_downloader(
+    folder: str,
+    progress_callback: Callable | None = None,
+    concurrent_fragments: int = CONCURRENT_FRAGMENTS,
+) -> 'yt_dlp.YoutubeDL':
+    """Return a ``YoutubeDL`` instance saving files to *folder*.
+
+    The instance can be reused for several URLs via :func:`download_url` and
+    should be closed by the caller afterwards. ``concurrent_fragments`` HLS/DASH
+    fragments of each video are fetched at once. ``yt_dlp`` is imported on
+    first use because loading its extractors dominates start-up time.
+    """
+    import yt_dlp
+
+    ydl_opts = _BASE_YDL_OPTS.copy()
+    ydl_opts['outtmpl'] = os.path.join(folder, OUTTMPL)
+    ydl_opts['concurrent_fragment_downloads'] = concurrent_fragments
+    if progress_callback:
+        ydl_opts['progress_hooks'] = [progress_callback]
+    return yt_dlp.YoutubeDL(ydl_opts)
+
+
+def cancel_download() -> None:
+    """Abort the running ``yt_dlp`` download; call from a progress hook."""
+    from yt_dlp.utils import DownloadCancelled
+
+    raise DownloadCancelled('Application is closing')
+
+
+def download_url(
+    url: str,
+    folder: str,
+    progress_callback: Callable | None = None,
+    ydl: 'yt_dlp.YoutubeDL | None' = None,
+) -> None:
     """Download a single URL to *folder* using ``yt_dlp``.
 
     ``progress_callback`` is passed directly to the yt_dlp progress hook.
+    When *ydl* is given the existing instance from :func:`create_downloader`
+    is reused and ``folder``/``progress_callback`` are ignored.
     Any exception from ``yt_dlp`` is logged and re-raised.
     """
-    ydl_opts = {
-        'format': 'best',
-        'outtmpl': os.path.join(folder, '%(title)s.%(ext)s'),
-        'merge_output_format': 'mp4',
-        'quiet': True,
-        'progress_hooks': [progress_callback] if progress_callback else None,
-    }
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        if ydl is not None:
             ydl.download([url])
+        else:
+            with create_downloader(folder, progress_callback) as new_ydl:
+                new_ydl.download([url])
     except Exception as e:
         logging.error('Download error: %s', e)
         raise
@@ -233,50 +595,135 @@ def download_url(url: str, folder: str, progress_callback: Callable | None = Non
 def run_headless() -> None:
     """Run downloader in console-only mode.
 
-    Hotkeys configured in ``config.ini`` remain functional. Progress for each
-    download is printed to stdout. Use ``Ctrl+C`` to exit.
+    Hotkeys configured in ``config.json`` remain functional. Up to
+    ``max_parallel`` URLs are downloaded at once and their average progress
+    is printed to stdout. Use ``Ctrl+C`` to exit.
     """
 
+    import keyboard
+    import pyperclip
+
     cfg = load_config()
     ensure_download_dir(cfg['download_path'])
-    links: List[str] = []
+    links: deque[str] = deque()
+    last_added = ''
 
-    def read_clipboard() -> None:
-        url = pyperclip.paste().strip()
-        if url:
+    def add_url(url: str) -> None:
+        nonlocal last_added
+        if not url:
+            print('Clipboard empty')
+        elif not is_url(url):
+            print('Not a URL, ignored')
+            logging.info('Non-URL clipboard ignored: %r', url[:60])
+        else:
+            last_added = url
             links.append(url)
             print(f"Added: {url}")
             logging.info('Added URL: %s', url)
-        else:
-            print('Clipboard empty')
+
+    def read_clipboard() -> None:
+        # Return as soon as the copied text arrives instead of a fixed delay
+        deadline = time.monotonic() + CLIPBOARD_TIMEOUT
+        text = clipboard_text()
+        while not text and time.monotonic() < deadline:
+            time.sleep(CLIPBOARD_POLL_MS / 1000)
+            text = clipboard_text()
+        add_url(text.strip())
 
     def add_from_clipboard() -> None:
         try:
+            selection = read_selection()
+            if selection is None:
+                # A freshly copied URL can be used without simulating Ctrl+C
+                current = clipboard_text().strip()
+                if current.startswith(URL_PREFIXES) and current != last_added:
+                    selection = current
+            if selection is not None:
+                add_url(selection.strip())
+                return
             pyperclip.copy('')
             keyboard.press_and_release('ctrl+c')
-            threading.Timer(0.2, read_clipboard).start()
+            # Poll off the hotkey thread so the hook stays responsive
+            threading.Thread(target=read_clipboard, daemon=True).start()
         except Exception as e:
             logging.error('Clipboard error: %s', e)
 
-    def progress_hook(d) -> None:
-        if d['status'] == 'downloading':
-            total = d.get('total_bytes') or d.get('total_bytes_estimate') or 1
-            percent = d['downloaded_bytes'] / total * 100
+    progress: dict[int, float] = {}
+    progress_lock = threading.Lock()
+    local = threading.local()
+    downloaders: list = []
+    downloading = threading.Event()
+    stop = threading.Event()
+    pool: ThreadPoolExecutor | None = None
+
+    def progress_hook(idx: int, d) -> None:
+        if stop.is_set():
+            cancel_download()
+        if d['status'] != 'downloading':
+            return
+        total = d.get('total_bytes') or d.get('total_bytes_estimate') or 1
+        with progress_lock:
+            progress[idx] = d['downloaded_bytes'] / total * 100
+            percent = sum(progress.values()) / len(progress)
             print(f"\r{percent:5.1f}%", end='', flush=True)
-        elif d['status'] == 'finished':
-            print()
+
+    def download_one(idx: int, url: str) -> None:
+        if stop.is_set():
+            return
+        if getattr(local, 'ydl', None) is None:
+            relay = ProgressRelay(progress_hook)
+            try:
+                local.ydl = create_downloader(
+                    cfg['download_path'], relay, get_concurrent_fragments(cfg)
+                )
+            except Exception as e:
+                logging.error('Failed to create downloader: %s', e)
+                return
+            local.relay = relay
+            downloaders.append(local.ydl)
+        local.relay.idx = idx
+        with progress_lock:
+            print(f'\nDownloading {url}')
+        try:
+            download_url(url, cfg['download_path'], ydl=local.ydl)
+        except Exception:
+            if stop.is_set():
+                return
+            with progress_lock:
+                print(f'\nFailed to download {url}')
+        with progress_lock:
+            progress[idx] = 100.0
+
+    def download_batches() -> None:
+        nonlocal pool
+        try:
+            # URLs added while a batch runs are picked up by the next one
+            while links and not stop.is_set():
+                urls = [links.popleft() for _ in range(len(links))]
+                progress.clear()
+                workers = min(get_max_parallel(cfg), len(urls))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    for idx, url in enumerate(urls):
+                        pool.submit(download_one, idx, url)
+                pool = None
+                for ydl in downloaders:
+                    ydl.close()
+                downloaders.clear()
+            if not stop.is_set():
+                print('\nAll downloads finished')
+        finally:
+            downloading.clear()
 
     def start_downloads() -> None:
+        if downloading.is_set():
+            print('Download already running')
+            return
         if not links:
             print('Queue is empty')
             return
-        while links:
-            url = links.pop(0)
-            print(f'Downloading {url}')
-            try:
-                download_url(url, cfg['download_path'], progress_hook)
-            except Exception:
-                print(f'Failed to download {url}')
+        downloading.set()
+        # Keep the hotkey thread free so URLs can be added during the batch
+        threading.Thread(target=download_batches, daemon=True).start()
 
     try:
         hotkey_manager.register(cfg['add_hotkey'], add_from_clipboard)
@@ -284,15 +731,23 @@ def run_headless() -> None:
     except Exception as e:
         logging.error('Failed to register hotkeys: %s', e)
 
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    # Lock waits are not interrupted by signals on Windows, so wake up there
+    # periodically to let the SIGINT handler run.
+    timeout = 1 if os.name == 'nt' else None
+
     print('Headless mode active. Press Ctrl+C to exit.')
     try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
+        while not stop.wait(timeout):
+            pass
         print('\nExiting...')
     finally:
+        stop.set()
+        if pool is not None:
+            # Pool threads are not daemons; drop queued URLs so exit is quick
+            pool.shutdown(wait=False, cancel_futures=True)
         try:
-            hotkey_manager.unregister_all()
+            hotkey_manager.shutdown()
         except Exception:
             pass
 
@@ -300,12 +755,36 @@ def run_headless() -> None:
 class TrayController:
     """Manage system tray icon and menu."""
 
+    # Icon files by state, relative to the bundled resources
+    ICONS = {
+        'default': ('ico', 'ico.ico'),
+        'active': ('ico', 'act.ico'),
+        'download': ('ico', 'dw.ico'),
+    }
+
     def __init__(self, app: 'App') -> None:
         self.app = app
+        self._icons: dict = {}
+        # Imported here so headless mode never loads pystray and Pillow
+        try:
+            import pystray
+            from PIL import Image
+        except Exception:  # When display server is missing
+            pystray = None  # type: ignore
+            Image = None  # type: ignore
         if pystray and Image:
+            # Decode the icons once instead of on every hotkey press
+            for key, parts in self.ICONS.items():
+                path = resource_path(*parts)
+                try:
+                    with Image.open(path) as img:
+                        self._icons[key] = img.copy()
+                except Exception as e:
+                    logging.error('Failed to load icon %s: %s', path, e)
+        if 'default' in self._icons:
             self.icon = pystray.Icon(
                 'YTDownloader',
-                Image.open(resource_path('ico', 'ico.ico')),
+                self._icons['default'],
                 'YT Downloader',
                 pystray.Menu(
                     pystray.MenuItem('Показать окно', self.show_app),
@@ -321,12 +800,9 @@ class TrayController:
         if self.icon:
             threading.Thread(target=self.icon.run, daemon=True).start()
 
-    def flash(self, path: str, duration: float = 0.3) -> None:
-        if not self.icon:
-            return
-        try:
-            img = Image.open(resource_path(path))
-        except Exception:
+    def flash(self, key: str, duration: float = 0.3) -> None:
+        img = self._icons.get(key)
+        if not self.icon or img is None:
             return
 
         current = self.icon.icon
@@ -338,13 +814,14 @@ class TrayController:
             except Exception:
                 pass
 
-        threading.Timer(duration, restore).start()
+        self.app.after(int(duration * 1000), restore)
 
-    def set_icon(self, path: str) -> None:
-        if not self.icon:
+    def set_icon(self, key: str) -> None:
+        img = self._icons.get(key)
+        if not self.icon or img is None:
             return
         try:
-            self.icon.icon = Image.open(resource_path(path))
+            self.icon.icon = img
         except Exception:
             pass
 
@@ -352,7 +829,7 @@ class TrayController:
         self.app.show_window()
 
     def on_download(self, icon, item) -> None:
-        self.app.start_downloads()
+        self.app.after(0, self.app.start_downloads)
 
     def open_folder(self, icon, item) -> None:
         folder = self.app.path_var.get()
@@ -388,13 +865,44 @@ class App(tk.Tk):
         self.cfg = load_config()
         ensure_download_dir(self.cfg['download_path'])
 
-        self.links: List[str] = []
+        self.links: deque[str] = deque()
+        self._last_added = ''
+        # Worker threads are created on demand and reused for every batch
+        self._parallel_cap = max(ADAPTIVE_MAX_PARALLEL, get_max_parallel(self.cfg))
+        self._pool = ThreadPoolExecutor(
+            max_workers=self._parallel_cap, thread_name_prefix='ytdl'
+        )
+        # Set by safe_exit; download threads check it to abort early
+        self._closing = False
+        # Download state below is only changed on the Tk thread
+        self._downloading = False
+        self._batch = 0
+        self._folder = ''
+        self._max_parallel = MAX_PARALLEL_DOWNLOADS
+        self._active = 0
+        self._pump_id = ''
+        self._tune_id = ''
+        self._bytes_done = 0
+        self._tune_bytes = 0
+        self._last_rate = 0.0
+        self._samples: list[float] = []
+        self._refilled = False
+        self._probing = False
+        self._last_bytes: dict[int, int] = {}
+        self._next_idx = 0
+        self._downloaders: list = []
+        self._local = threading.local()
+        self._progress: dict[int, float] = {}
+        self._progress_lock = threading.Lock()
+        self._last_filled = 0
         self.tray = TrayController(self)
         self.tray.run()
 
         self.create_widgets()
         self.register_hotkeys()
         self.protocol('WM_DELETE_WINDOW', self.hide_window)
+        # Load yt_dlp in the background once the window is shown
+        self.after_idle(lambda: self._pool.submit(preload_yt_dlp))
 
     def show_window(self) -> None:
         self.deiconify()
@@ -403,10 +911,17 @@ class App(tk.Tk):
         self.withdraw()
 
     def safe_exit(self) -> None:
+        """Close the app, aborting downloads that are still running.
+
+        Pool threads are not daemons, so running downloads are cancelled from
+        the progress hook instead of being left to keep the process alive.
+        """
+        self._closing = True
         try:
-            hotkey_manager.unregister_all()
+            hotkey_manager.shutdown()
         except Exception:
             pass
+        self._pool.shutdown(wait=False, cancel_futures=True)
         self.destroy()
 
     def create_widgets(self) -> None:
@@ -472,10 +987,14 @@ class App(tk.Tk):
 
     def _update_progress(self, percent: float) -> None:
         filled = int(percent // 25)
-        for i, dot in enumerate(self.progress_dots):
+        if filled == self._last_filled:
+            return
+        # Only the dots between the old and the new count change colour
+        low, high = sorted((self._last_filled, filled))
+        self._last_filled = filled
+        for i in range(low, min(high, len(self.progress_dots))):
             color = FG_COLOR if i < filled else PROGRESS_EMPTY
-            self.progress_canvas.itemconfig(dot, fill=color)
-        self.update_idletasks()
+            self.progress_canvas.itemconfig(self.progress_dots[i], fill=color)
 
     def choose_path(self) -> None:
         """Show folder selection dialog and update path variable."""
@@ -484,35 +1003,49 @@ class App(tk.Tk):
             self.path_var.set(new_path)
 
     def apply_settings(self) -> None:
-        """Save settings and re-register hotkeys."""
-        try:
-            hotkey_manager.unregister_all()
-        except Exception:
-            pass
-
+        """Save settings and re-register hotkeys if they changed."""
+        old_hotkeys = (self.cfg['add_hotkey'], self.cfg['download_hotkey'])
         self.cfg['download_path'] = self.path_var.get()
         self.cfg['add_hotkey'] = self.add_hotkey_var.get() or DEFAULT_CONFIG['add_hotkey']
         self.cfg['download_hotkey'] = self.download_hotkey_var.get() or DEFAULT_CONFIG['download_hotkey']
         ensure_download_dir(self.cfg['download_path'])
         save_config(self.cfg)
-        self.register_hotkeys()
+        if (self.cfg['add_hotkey'], self.cfg['download_hotkey']) != old_hotkeys:
+            try:
+                hotkey_manager.unregister_all()
+            except Exception:
+                pass
+            self.register_hotkeys()
         messagebox.showinfo('Hotkeys', 'Settings applied')
 
     def register_hotkeys(self) -> None:
         """Register global hotkeys for adding links and starting downloads."""
+        # Hotkey callbacks arrive on a background thread; hand them to Tk
         try:
-            hotkey_manager.register(self.cfg['add_hotkey'], self.add_from_clipboard)
-            hotkey_manager.register(self.cfg['download_hotkey'], self.start_downloads)
+            hotkey_manager.register(self.cfg['add_hotkey'], lambda: self.after(0, self.add_from_clipboard))
+            hotkey_manager.register(self.cfg['download_hotkey'], lambda: self.after(0, self.start_downloads))
         except Exception as e:
             logging.error('Failed to register hotkeys: %s', e)
 
     def add_from_clipboard(self) -> None:
-        """Grab URL from clipboard and add it to the queue."""
+        """Grab the selected URL and add it to the queue."""
         try:
-            pyperclip.copy('')
-            keyboard.press_and_release('ctrl+c')
-            threading.Timer(0.2, self._read_clipboard).start()
-            self.tray.flash('ico/act.ico')
+            selection = read_selection()
+            if selection is None:
+                # A freshly copied URL can be used without simulating Ctrl+C
+                current = clipboard_text().strip()
+                if current.startswith(URL_PREFIXES) and current != self._last_added:
+                    selection = current
+            if selection is not None:
+                self._add_text(selection)
+            else:
+                import keyboard
+                import pyperclip
+
+                pyperclip.copy('')
+                keyboard.press_and_release('ctrl+c')
+                self._poll_clipboard(time.monotonic() + CLIPBOARD_TIMEOUT)
+            self.tray.flash('active')
         except Exception as e:
             logging.error('Clipboard error: %s', e)
 
@@ -521,27 +1054,54 @@ class App(tk.Tk):
         url = self.link_var.get().strip()
         if not url:
             return
-        self.links.append(url)
-        self.listbox.insert(tk.END, url)
+        self.add_urls([url])
         self.link_var.set('')
         logging.info('Added URL manually: %s', url)
 
-    def _read_clipboard(self) -> None:
-        """Read clipboard contents and append to the listbox."""
-        url = pyperclip.paste().strip()
-        if url:
-            self.links.append(url)
-            self.listbox.insert(tk.END, url)
-            logging.info('Added URL: %s', url)
+    def _poll_clipboard(self, deadline: float) -> None:
+        """Queue the clipboard text as soon as the copied selection arrives."""
+        text = clipboard_text()
+        if text.strip() or time.monotonic() >= deadline:
+            self._add_text(text)
         else:
+            self.after(CLIPBOARD_POLL_MS, self._poll_clipboard, deadline)
+
+    def add_urls(self, urls: list[str]) -> None:
+        """Append *urls* to the queue with a single listbox update."""
+        self.links.extend(urls)
+        self.listbox.insert(tk.END, *urls)
+
+    def _add_text(self, text: str) -> None:
+        """Queue every line of copied *text* that is a URL."""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines:
             logging.info('Clipboard empty')
+            return
+        urls = [line for line in lines if is_url(line)]
+        if not urls:
+            logging.info('Non-URL clipboard ignored: %r', lines[0][:60])
+            return
+        self._last_added = text.strip()
+        self.add_urls(urls)
+        for url in urls:
+            logging.info('Added URL: %s', url)
 
     def remove_selected(self) -> None:
         """Remove selected items from the queue."""
-        sel = list(self.listbox.curselection())
-        for i in reversed(sel):
-            self.listbox.delete(i)
-            del self.links[i]
+        sel = self.listbox.curselection()
+        if not sel:
+            return
+        selected = set(sel)
+        self.links = deque(url for i, url in enumerate(self.links) if i not in selected)
+        # Delete each run of adjacent rows with one call, starting from the end
+        runs: list[list[int]] = []
+        for i in sel:
+            if runs and runs[-1][1] == i - 1:
+                runs[-1][1] = i
+            else:
+                runs.append([i, i])
+        for first, last in reversed(runs):
+            self.listbox.delete(first, last)
 
     def clear_list(self) -> None:
         """Remove all URLs from the queue."""
@@ -549,33 +1109,179 @@ class App(tk.Tk):
         self.links.clear()
 
     def start_downloads(self) -> None:
-        """Start background thread to download all queued URLs."""
-        if not self.links:
+        """Start downloading the queued URLs in the background.
+
+        Up to ``max_parallel`` URLs from the config are taken from the head of
+        the queue at a time; the next one starts whenever a download finishes.
+        URLs added while downloading are picked up by the same batch. With
+        ``adaptive_parallel`` enabled the limit is then tuned by
+        :meth:`_tune_parallel`.
+        """
+        if not self.links or self._downloading:
             return
-        threading.Thread(target=self._download_worker, daemon=True).start()
-
-    def _download_worker(self) -> None:
-        """Worker thread that iterates over the queue and downloads each URL."""
-        folder = self.path_var.get()
-        self.tray.set_icon('ico/dw.ico')
-        for idx, url in enumerate(list(self.links)):
-            self._update_progress(0)
-            try:
-                download_url(url, folder, self._progress_hook)
-            except Exception:
-                messagebox.showerror('Error', f'Failed to download {url}')
-            self.listbox.delete(0)
-            self.links.pop(0)
+        self._downloading = True
+        self._batch += 1
+        self._folder = self.path_var.get()
+        self._max_parallel = get_max_parallel(self.cfg)
+        self._next_idx = 0
+        with self._progress_lock:
+            self._progress = {}
+            self._last_bytes = {}
+            self._bytes_done = 0
+        self._tune_bytes = 0
+        self._last_rate = 0.0
+        self._samples.clear()
+        self._refilled = False
+        self._probing = False
+        self.tray.set_icon('download')
         self._update_progress(0)
-        self.tray.set_icon('ico/ico.ico')
+        self._pump_progress()
+        if is_adaptive(self.cfg):
+            self._tune_id = self.after(TUNE_INTERVAL_MS, self._tune_parallel)
+        self._fill_slots()
+
+    def _download_one(self, idx: int, url: str) -> None:
+        """Download *url* reusing the ``YoutubeDL`` instance of this thread."""
+        if self._closing:
+            return
+        local = self._local
+        # Instances are closed after each batch and bound to its folder
+        if getattr(local, 'batch', None) != self._batch:
+            relay = ProgressRelay(self._on_progress)
+            local.ydl = create_downloader(
+                self._folder, relay, get_concurrent_fragments(self.cfg)
+            )
+            local.relay = relay
+            # Only now: after a failure the next URL must retry, not reuse
+            # the closed instance of the previous batch
+            local.batch = self._batch
+            self._downloaders.append(local.ydl)
+        local.relay.idx = idx
+        download_url(url, self._folder, ydl=local.ydl)
+
+    def _fill_slots(self) -> None:
+        """Submit queued URLs while there are free download slots."""
+        started = 0
+        while self.links and self._active < self._max_parallel:
+            url = self.links.popleft()
+            started += 1
+            idx = self._next_idx
+            self._next_idx += 1
+            with self._progress_lock:
+                self._progress[idx] = 0.0
+            self._active += 1
+            future = self._pool.submit(self._download_one, idx, url)
+            future.add_done_callback(
+                lambda f, idx=idx, url=url: self._schedule_done(idx, url, f)
+            )
+        if started:
+            self._refilled = True
+            self.listbox.delete(0, started - 1)
+        if not self._active:
+            self._finish_downloads()
+
+    def _schedule_done(self, idx: int, url: str, future) -> None:
+        """Hand a finished download over to the Tk thread unless closing."""
+        if self._closing:
+            return
+        try:
+            self.after(0, self._on_download_done, idx, url, future)
+        except (RuntimeError, tk.TclError):
+            # The window was destroyed between the check and the call
+            pass
+
+    def _on_download_done(self, idx: int, url: str, future) -> None:
+        if future.exception() is not None:
+            if self._tune_id:
+                # Failures may mean the server throttles us; back off a little
+                self._set_parallel(self._max_parallel - 1)
+            messagebox.showerror('Error', f'Failed to download {url}')
+        self._refilled = True
+        self._active -= 1
+        with self._progress_lock:
+            self._progress[idx] = 100.0
+        self._fill_slots()
+
+    def _finish_downloads(self) -> None:
+        self.after_cancel(self._pump_id)
+        if self._tune_id:
+            self.after_cancel(self._tune_id)
+            self._tune_id = ''
+        self._downloading = False
+        for ydl in self._downloaders:
+            ydl.close()
+        self._downloaders.clear()
+        self._update_progress(0)
+        self.tray.set_icon('default')
         messagebox.showinfo('Done', 'All downloads finished')
 
-    def _progress_hook(self, d):
-        """Update progress bar using ``yt_dlp`` progress hooks."""
-        if d['status'] == 'downloading':
-            total = d.get('total_bytes') or d.get('total_bytes_estimate') or 1
-            percent = d['downloaded_bytes'] / total * 100
-            self._update_progress(percent)
+    def _on_progress(self, idx: int, d) -> None:
+        """Record ``yt_dlp`` progress of the download number *idx*.
+
+        Runs on a download thread and never touches Tk; ``_pump_progress``
+        picks the value up on the main thread. Once the app is closing the
+        download is aborted.
+        """
+        if self._closing:
+            cancel_download()
+        if d['status'] != 'downloading':
+            return
+        total = d.get('total_bytes') or d.get('total_bytes_estimate') or 1
+        done = d['downloaded_bytes']
+        with self._progress_lock:
+            self._progress[idx] = done / total * 100
+            # A counter that went back means yt_dlp started the next format
+            last = self._last_bytes.get(idx, 0)
+            self._bytes_done += done - last if done >= last else done
+            self._last_bytes[idx] = done
+
+    def _pump_progress(self) -> None:
+        """Redraw the average progress of the batch while downloads run."""
+        with self._progress_lock:
+            values = list(self._progress.values())
+        if values:
+            self._update_progress(sum(values) / len(values))
+        self._pump_id = self.after(PROGRESS_INTERVAL_MS, self._pump_progress)
+
+    def _set_parallel(self, value: int) -> None:
+        value = min(max(1, value), self._parallel_cap)
+        if value != self._max_parallel:
+            logging.info('Parallel downloads: %d -> %d', self._max_parallel, value)
+            self._max_parallel = value
+
+    def _tune_parallel(self) -> None:
+        """Adjust the download limit to the measured throughput (AIMD).
+
+        Throughput is averaged over ``TUNE_SAMPLES`` samples and compared
+        with the previous average: one more slot is opened when it rose by
+        more than 5 % and taken back if that slot brought no gain. The limit
+        is halved only when throughput fell by more than 25 %, so ordinary
+        noise does not shrink it. Samples in which a download started or
+        finished are skipped, since the gap between downloads looks like a
+        drop in throughput.
+        """
+        with self._progress_lock:
+            done = self._bytes_done
+        rate = (done - self._tune_bytes) * 1000 / TUNE_INTERVAL_MS
+        self._tune_bytes = done
+        if self._refilled:
+            self._refilled = False
+        else:
+            self._samples.append(rate)
+        if len(self._samples) >= TUNE_SAMPLES:
+            rate = sum(self._samples) / len(self._samples)
+            self._samples.clear()
+            probing, self._probing = self._probing, False
+            if rate > self._last_rate * 1.05:
+                self._set_parallel(self._max_parallel + 1)
+                self._probing = True
+            elif rate < self._last_rate * 0.75:
+                self._set_parallel(self._max_parallel // 2)
+            elif probing:
+                self._set_parallel(self._max_parallel - 1)
+            self._last_rate = rate
+        self._tune_id = self.after(TUNE_INTERVAL_MS, self._tune_parallel)
+        self._fill_slots()
 
 
 if __name__ == '__main__':
@@ -588,6 +1294,6 @@ if __name__ == '__main__':
             app.mainloop()
     finally:
         try:
-            hotkey_manager.unregister_all()
+            hotkey_manager.shutdown()
         except Exception:
             pass
@@ -3,14 +3,23 @@ import sys
 import atexit
 import time
 import configparser
+import json
+import hashlib
 import logging
+import logging.handlers
 from urllib.parse import urlparse
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 import re
+import html
+import queue
+import itertools
+import shutil
 
 import yt_dlp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import keyboard
 import pystray
 import pyperclip
@@ -19,19 +28,51 @@ try:
     import win32con
     import win32api
     import win32gui
+    import win32event
+    import winerror
 except Exception:
-    win32con = win32api = win32gui = None  # type: ignore
+    win32con = win32api = win32gui = win32event = winerror = None  # type: ignore
+if os.name == 'nt':
+    import ctypes
+    user32 = ctypes.windll.user32
+else:
+    user32 = None
 from PIL import Image
 import subprocess
 
 
 class HotkeyManager:
-    """Cross-platform hotkey registration using pywin32 when possible."""
+    """Cross-platform hotkey registration using pywin32 when possible.
+
+    ``RegisterHotKey`` привязывает сочетание к вызывающему потоку, поэтому
+    регистрация выполняется в потоке цикла сообщений: только там приходит
+    ``WM_HOTKEY``.
+    """
+
+    # Посылается потоку цикла, когда в ``_calls`` есть задачи
+    WM_LOOP_CALL = 0x8000 + 1  # WM_APP + 1
+    # Сколько секунд ждать ответа потока цикла
+    LOOP_CALL_TIMEOUT = 2
+
+    # Modifier flags and virtual-key codes by lowercase name, e.g. 'space'
+    _MOD_MAP = {
+        'ctrl': win32con.MOD_CONTROL,
+        'alt': win32con.MOD_ALT,
+        'shift': win32con.MOD_SHIFT,
+        'win': win32con.MOD_WIN,
+    } if win32con else {}
+    _VK_MAP = {
+        name[3:].lower(): getattr(win32con, name)
+        for name in dir(win32con) if name.startswith('VK_')
+    } if win32con else {}
 
     def __init__(self) -> None:
         self.ids: dict[int, callable] = {}
         self._counter = 1
         self._loop_thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._calls: queue.Queue = queue.Queue()
 
     def _parse_win(self, combo: str) -> tuple[int, int] | None:
         if not win32con:
@@ -39,19 +80,14 @@ class HotkeyManager:
         mods = 0
         key = None
         for part in combo.lower().split('+'):
-            if part == 'ctrl':
-                mods |= win32con.MOD_CONTROL
-            elif part == 'alt':
-                mods |= win32con.MOD_ALT
-            elif part == 'shift':
-                mods |= win32con.MOD_SHIFT
-            elif part == 'win':
-                mods |= win32con.MOD_WIN
-            else:
+            mod = self._MOD_MAP.get(part)
+            if mod is None:
                 key = part
+            else:
+                mods |= mod
         if key is None:
             return None
-        vk = getattr(win32con, f'VK_{key.upper()}', None)
+        vk = self._VK_MAP.get(key)
         if vk is None:
             if len(key) == 1:
                 vk = ord(key.upper())
@@ -60,47 +96,90 @@ class HotkeyManager:
         return mods, vk
 
     def _run_loop(self) -> None:
-        if not win32gui:
-            return
+        self._thread_id = win32api.GetCurrentThreadId()
+        # Очередь сообщений должна существовать до того, как в неё напишут
+        win32gui.PeekMessage(None, 0, 0, win32con.PM_NOREMOVE)
+        self._ready.set()
         while True:
-            msg = win32gui.GetMessage(None, 0, 0)
-            if not msg:
+            rc, msg = win32gui.GetMessage(None, 0, 0)
+            if rc <= 0:
                 break
-            if msg[1][1] == win32con.WM_HOTKEY:
-                cb = self.ids.get(msg[1][2])
+            if msg[1] == win32con.WM_HOTKEY:
+                cb = self.ids.get(msg[2])
                 if cb:
-                    cb()
-            win32gui.TranslateMessage(msg[1])
-            win32gui.DispatchMessage(msg[1])
+                    try:
+                        cb()
+                    except Exception as e:
+                        logging.error('Ошибка обработчика горячей клавиши: %s', e)
+            elif msg[1] == self.WM_LOOP_CALL:
+                while not self._calls.empty():
+                    func, result, done = self._calls.get()
+                    try:
+                        result.append(func())
+                    except Exception as e:
+                        logging.error('Win32 hotkey failed: %s', e)
+                        result.append(False)
+                    done.set()
+            win32gui.TranslateMessage(msg)
+            win32gui.DispatchMessage(msg)
+
+    def _call_in_loop(self, func):
+        """Выполняет *func* в потоке цикла сообщений и возвращает результат.
+
+        Если поток завершился или не ответил за ``LOOP_CALL_TIMEOUT`` секунд,
+        возвращается ``None``.
+        """
+        if not self._loop_thread:
+            self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
+            self._loop_thread.start()
+        if threading.current_thread() is self._loop_thread:
+            return func()
+        if not self._ready.wait(self.LOOP_CALL_TIMEOUT) or not self._loop_thread.is_alive():
+            return None
+        result: list = []
+        done = threading.Event()
+        self._calls.put((func, result, done))
+        win32api.PostThreadMessage(self._thread_id, self.WM_LOOP_CALL, 0, 0)
+        if not done.wait(self.LOOP_CALL_TIMEOUT):
+            logging.error('Цикл сообщений горячих клавиш не отвечает')
+            return None
+        return result[0]
 
     def register(self, combo: str, callback) -> None:
-        if os.name == 'nt' and win32api:
+        if user32 and win32gui:
             parsed = self._parse_win(combo)
             if parsed:
                 mods, vk = parsed
                 hot_id = self._counter
                 self._counter += 1
-                try:
-                    if win32api.RegisterHotKey(None, hot_id, mods, vk):
-                        self.ids[hot_id] = callback
-                        if not self._loop_thread:
-                            self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
-                            self._loop_thread.start()
-                        return
-                except Exception as e:
-                    logging.error('Win32 hotkey failed: %s', e)
+                if self._call_in_loop(lambda: user32.RegisterHotKey(None, hot_id, mods, vk)):
+                    self.ids[hot_id] = callback
+                    return
+                logging.error('Win32 hotkey failed: %s', combo)
         keyboard.add_hotkey(combo, callback, suppress=True, trigger_on_release=True)
 
     def unregister_all(self) -> None:
-        if os.name == 'nt' and win32api:
-            for hot_id in list(self.ids):
-                try:
-                    win32api.UnregisterHotKey(None, hot_id)
-                except Exception:
-                    pass
+        if self.ids:
+            hot_ids = list(self.ids)
             self.ids.clear()
+            self._call_in_loop(lambda: [user32.UnregisterHotKey(None, i) for i in hot_ids])
         keyboard.unhook_all_hotkeys()
 
+    def shutdown(self) -> None:
+        """Снимает все горячие клавиши и останавливает поток цикла сообщений."""
+        thread = self._loop_thread
+        if thread is not None and not thread.is_alive():
+            # Сочетания освобождаются вместе с потоком, остались только хуки keyboard
+            self.ids.clear()
+        self.unregister_all()
+        if thread is None:
+            return
+        if thread.is_alive():
+            win32api.PostThreadMessage(self._thread_id, win32con.WM_QUIT, 0, 0)
+            thread.join(timeout=1)
+        self._loop_thread = None
+        self._ready.clear()
+
 
 hotkey_manager = HotkeyManager()
 
@@ -121,14 +200,29 @@ def resource_path(*parts: str) -> str:
     return os.path.join(base, *parts)
 
 
+def get_cache_dir() -> str:
+    """Возвращает папку пользователя для кэша yt_dlp.
+
+    Кэш не хранится в ``system``: эта папка попадает в exe, а в собранной
+    программе может оказаться во временном каталоге распаковки.
+    """
+    base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else os.environ.get('XDG_CACHE_HOME')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'YTDownloader', 'ytdlp-cache')
+
+
 # === Пути и файлы ===
 ROOT_DIR = get_root_dir()
 SYSTEM_DIR = os.path.join(ROOT_DIR, 'system')
 ICO_DIR = os.path.join(ROOT_DIR, 'ico')
 DOWNLOAD_LIST = os.path.join(SYSTEM_DIR, 'download-list.txt')
-CONFIG_FILE = os.path.join(SYSTEM_DIR, 'config.ini')
+CONFIG_FILE = os.path.join(SYSTEM_DIR, 'config.json')
+# Старый формат настроек, читается один раз для переноса в config.json
+LEGACY_CONFIG_FILE = os.path.join(SYSTEM_DIR, 'config.ini')
 LOG_FILE = os.path.join(SYSTEM_DIR, 'script.log')
 INFO_FILE = os.path.join(SYSTEM_DIR, 'info.txt')
+YDL_CACHE_DIR = get_cache_dir()
 
 # Ensure the system directory exists before configuring logging
 os.makedirs(SYSTEM_DIR, exist_ok=True)
@@ -141,21 +235,56 @@ PLAYLIST_FOLDER = os.path.join(VIDEOS_FOLDER, 'Playlist Videos')
 PICTURES_FOLDER = os.path.join(DOWNLOADS_FOLDER, 'Pictures')
 WB_FOLDER = os.path.join(PICTURES_FOLDER, 'Wildberries')
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-)
+def setup_logging() -> logging.handlers.QueueListener:
+    """Пишет журнал в файл из отдельного потока.
+
+    Потоки загрузки и горячих клавиш только кладут записи в очередь, поэтому
+    запись на диск их не задерживает.
+    """
+    file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
+    file_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+setup_logging()
 
 # Флаг, указывающий выполняется ли сейчас скачивание
 downloading = threading.Event()
+# Выставляется при выходе: загрузки прерываются, очередь не запускается
+stop_requested = threading.Event()
+# Пул текущего download_all, чтобы выход мог отменить ещё не начатые задачи
+_download_pool: Optional[ThreadPoolExecutor] = None
+
+# Параллельные загрузки печатают в консоль из разных потоков
+_print_lock = threading.Lock()
+
+
+def safe_print(*args) -> None:
+    """Печатает сообщение, не перемешивая его с выводом других потоков."""
+    with _print_lock:
+        print(*args)
 
 # Изображения для разных состояний значка
+ICON_SIZE = (64, 64)
 
 def load_icon(name: str) -> Optional[Image.Image]:
     """Load an icon image, returning ``None`` on failure."""
+    # Decode once at startup and release the file; Image.open alone is lazy.
+    # pystray re-encodes the image on every swap, so hand it a small RGBA copy.
     try:
-        return Image.open(resource_path(name))
+        with Image.open(resource_path(name)) as img:
+            icon = img.convert('RGBA')
+        icon.thumbnail(ICON_SIZE, Image.LANCZOS)
+        return icon
     except Exception:
         return None
 
@@ -163,8 +292,29 @@ ICON_DEFAULT = load_icon(os.path.join('ico', 'eye-Normal-State.ico'))
 ICON_ACTIVE = load_icon(os.path.join('ico', 'eye-Hot-key.ico'))
 ICON_DOWNLOADING = load_icon(os.path.join('ico', 'download-solid(Normal-State).ico'))
 
+# Отложенные восстановления значка: (время, номер, значок, прежнее изображение)
+_flash_queue: queue.PriorityQueue = queue.PriorityQueue()
+_flash_seq = itertools.count()
+_flash_lock = threading.Lock()
+_flash_thread: threading.Thread | None = None
+
+
+def _flash_worker() -> None:
+    """Возвращает значки по истечении времени; один поток на всё приложение."""
+    while True:
+        restore_at, _, icon, previous = _flash_queue.get()
+        delay = restore_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            icon.icon = previous
+        except Exception:
+            pass
+
+
 def flash_tray_icon(icon: pystray.Icon, image: Image.Image, duration: float = 0.3) -> None:
     """Temporarily change the tray icon."""
+    global _flash_thread
     if not icon or not image:
         return
     current = icon.icon
@@ -173,18 +323,25 @@ def flash_tray_icon(icon: pystray.Icon, image: Image.Image, duration: float = 0.
     except Exception:
         return
 
-    def restore() -> None:
-        try:
-            icon.icon = current
-        except Exception:
-            pass
+    with _flash_lock:
+        if _flash_thread is None:
+            _flash_thread = threading.Thread(target=_flash_worker, daemon=True)
+            _flash_thread.start()
+    _flash_queue.put((time.monotonic() + duration, next(_flash_seq), icon, current))
 
-    threading.Timer(duration, restore).start()
 
+MAX_PARALLEL_DOWNLOADS = 4
+# Число фрагментов HLS/DASH, которые yt_dlp качает одновременно
+CONCURRENT_FRAGMENTS = 8
+# Сколько ждать (с) скопированный текст после Ctrl+C и как часто проверять
+CLIPBOARD_TIMEOUT = 0.5
+CLIPBOARD_POLL = 0.01
 
 DEFAULT_CONFIG = {
     'add_hotkey': 'ctrl+space',
     'download_hotkey': 'ctrl+shift+space',
+    'max_parallel': str(MAX_PARALLEL_DOWNLOADS),
+    'concurrent_fragments': str(CONCURRENT_FRAGMENTS),
 }
 
 
@@ -195,34 +352,146 @@ def ensure_directories() -> None:
     os.makedirs(PLAYLIST_FOLDER, exist_ok=True)
     os.makedirs(PICTURES_FOLDER, exist_ok=True)
     os.makedirs(WB_FOLDER, exist_ok=True)
+    os.makedirs(YDL_CACHE_DIR, exist_ok=True)
 
-def load_config() -> dict:
+# Разобранный config.json, ключ — время изменения и размер файла
+_CFG_CACHE: dict = {}
+# Хэш содержимого config.json с тем же ключом, что и у _CFG_CACHE
+_CFG_DIGEST: dict = {}
+
+
+def _write_config(data: dict) -> bool:
+    """Атомарно записывает словарь настроек в config.json.
+
+    Если содержимое файла не изменится, запись пропускается и возвращается
+    ``False``.
+    """
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    digest = hashlib.blake2b(text.encode('utf-8')).digest()
+    try:
+        st = os.stat(CONFIG_FILE)
+        key = (st.st_mtime_ns, st.st_size)
+        if _CFG_DIGEST.get('key') != key:
+            with open(CONFIG_FILE, encoding='utf-8') as f:
+                _CFG_DIGEST['digest'] = hashlib.blake2b(f.read().encode('utf-8')).digest()
+            _CFG_DIGEST['key'] = key
+        if _CFG_DIGEST['digest'] == digest:
+            return False
+    except OSError:
+        pass
+    # Write to a temporary file first so a crash never leaves a truncated config
+    tmp = CONFIG_FILE + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, CONFIG_FILE)
+    st = os.stat(CONFIG_FILE)
+    _CFG_DIGEST['key'] = (st.st_mtime_ns, st.st_size)
+    _CFG_DIGEST['digest'] = digest
+    return True
+
+
+def _migrate_ini() -> None:
+    """Однократно переносит настройки из старого config.ini в config.json."""
     parser = configparser.ConfigParser()
-    if parser.read(CONFIG_FILE, encoding='utf-8'):
+    try:
+        if not parser.read(LEGACY_CONFIG_FILE, encoding='utf-8'):
+            return
+        data = {k: v for section in parser.sections() for k, v in parser.items(section)}
+        _write_config(data)
+    except Exception as e:
+        logging.error('Ошибка переноса %s: %s', LEGACY_CONFIG_FILE, e)
+        return
+    logging.info('Настройки перенесены из %s в %s', LEGACY_CONFIG_FILE, CONFIG_FILE)
+
+
+def _read_config() -> dict:
+    with open(CONFIG_FILE, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError('ожидался JSON-объект')
+    return data
+
+
+def load_config() -> dict:
+    """Читает config.json; повторный разбор только после изменения файла."""
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
+        _migrate_ini()
         try:
-            data = dict(parser.items('hotkeys'))
-            return {**DEFAULT_CONFIG, **data}
-        except Exception as e:
-            logging.error('Ошибка загрузки конфигурации: %s', e)
-    return DEFAULT_CONFIG.copy()
+            st = os.stat(CONFIG_FILE)
+        except OSError:
+            return DEFAULT_CONFIG.copy()
+    except OSError:
+        return DEFAULT_CONFIG.copy()
+    key = (st.st_mtime_ns, st.st_size)
+    if _CFG_CACHE.get('key') == key:
+        return _CFG_CACHE['val'].copy()
+
+    try:
+        data = _read_config()
+    except (OSError, ValueError) as e:
+        logging.error('Ошибка загрузки конфигурации: %s', e)
+        return DEFAULT_CONFIG.copy()
+    # Значения храним строками, как раньше в config.ini
+    cfg = {**DEFAULT_CONFIG, **{k: str(v) for k, v in data.items()}}
+    _CFG_CACHE['key'] = key
+    _CFG_CACHE['val'] = cfg
+    return cfg.copy()
+
+
+def _positive_int(cfg: dict, key: str, default: int) -> int:
+    try:
+        return max(1, int(cfg.get(key, default)))
+    except ValueError:
+        logging.error('Неверное значение %s: %s', key, cfg.get(key))
+        return default
+
+
+def get_max_parallel(cfg: dict) -> int:
+    """Возвращает число одновременных загрузок из настроек."""
+    return _positive_int(cfg, 'max_parallel', MAX_PARALLEL_DOWNLOADS)
+
+
+def get_concurrent_fragments(cfg: dict) -> int:
+    """Возвращает число фрагментов, скачиваемых yt_dlp параллельно."""
+    return _positive_int(cfg, 'concurrent_fragments', CONCURRENT_FRAGMENTS)
 
 
 def save_config(cfg: dict) -> None:
-    parser = configparser.ConfigParser()
-    parser['hotkeys'] = {
-        'add_hotkey': cfg.get('add_hotkey', DEFAULT_CONFIG['add_hotkey']),
-        'download_hotkey': cfg.get('download_hotkey', DEFAULT_CONFIG['download_hotkey'])
-    }
+    # Keep keys used by gui_downloader.py
+    try:
+        data = _read_config()
+    except (OSError, ValueError):
+        data = {}
+    for key in ('add_hotkey', 'download_hotkey'):
+        data[key] = str(cfg.get(key, DEFAULT_CONFIG[key]))
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            parser.write(f)
+        if not _write_config(data):
+            return
     except Exception as e:
         logging.error('Ошибка сохранения конфигурации: %s', e)
+    _CFG_CACHE.clear()
+
+
+# Именованный мьютекс живёт, пока жив процесс; ОС освобождает его сама
+INSTANCE_MUTEX = 'Local\\YTDownloaderSingleton'
+_instance_mutex = None
 
 
 def ensure_single_instance() -> None:
     """Предотвращает запуск нескольких экземпляров скрипта."""
-    if sys.platform.startswith('win'):
+    global _instance_mutex
+    if sys.platform.startswith('win') and win32event:
+        _instance_mutex = win32event.CreateMutex(None, False, INSTANCE_MUTEX)
+        if win32api.GetLastError() == winerror.ERROR_ALREADY_EXISTS:
+            logging.info('Попытка запуска второго экземпляра.')
+            print('Скрипт уже запущен.')
+            sys.exit(0)
+    elif sys.platform.startswith('win'):
+        # Без pywin32 остаётся блокировка lock-файла
         import msvcrt
         lock_path = os.path.join(SYSTEM_DIR, 'script.lock')
         lock_file = open(lock_path, 'w')
@@ -245,57 +514,158 @@ def ensure_single_instance() -> None:
         atexit.register(release_lock)
 
 
-def download_video(url, folder):
-    ydl_opts = {
+def create_session() -> requests.Session:
+    """Создаёт HTTP-сессию с пулом соединений для Pinterest и WB."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": "Mozilla/5.0"})
+    # Соединения без ответа не повторяем: WB перебирает несуществующие хосты
+    retry = Retry(total=3, connect=0, backoff_factor=0.3,
+                  status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Общая сессия избавляет от повторных DNS/TCP/TLS рукопожатий
+SESSION = create_session()
+
+# Размер блока при записи скачанных файлов на диск
+COPY_BUFFER = 64 * 1024
+
+
+def download_file(url: str, path: str, timeout: float = 10) -> None:
+    """Сохраняет файл по ссылке блоками, не держа его целиком в памяти."""
+    with SESSION.get(url, stream=True, timeout=timeout) as r:
+        r.raise_for_status()
+        # r.raw отдаёт байты как есть; gzip/deflate должен распаковать urllib3
+        r.raw.decode_content = True
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(r.raw, f, COPY_BUFFER)
+
+
+# Общие параметры; outtmpl добавляется в get_downloader по папке назначения
+YDL_OPTS = {
+    'video': {
         'format': 'best',
-        'outtmpl': os.path.join(folder, '%(title)s.%(ext)s'),
         'merge_output_format': 'mp4',
         'quiet': False,
         'no_warnings': True,
-    }
+        'cachedir': YDL_CACHE_DIR,
+        # Ошибка одного видео не должна прерывать весь пакет
+        'ignoreerrors': True,
+    },
+    'playlist': {
+        'format': 'best',
+        'merge_output_format': 'mp4',
+        'quiet': False,
+        'no_warnings': True,
+        'cachedir': YDL_CACHE_DIR,
+        'yes_playlist': True,
+        # Скачивать ролики по мере получения списка, не дожидаясь его целиком
+        'lazy_playlist': True,
+    },
+}
+
+# Экземпляры YoutubeDL создаются один раз на поток загрузки и вид ссылки
+_ydl_local = threading.local()
+_ydl_instances: list = []
+_ydl_lock = threading.Lock()
+
+
+def _abort_if_stopped(d: dict) -> None:
+    """Progress hook: прерывает загрузку, если пользователь вышел из программы."""
+    if stop_requested.is_set():
+        raise yt_dlp.utils.DownloadCancelled('Выход из программы')
+
+
+def get_downloader(kind: str, folder: str) -> yt_dlp.YoutubeDL:
+    """Возвращает YoutubeDL текущего потока для ``kind`` и папки ``folder``."""
+    cache = getattr(_ydl_local, 'cache', None)
+    if cache is None:
+        cache = _ydl_local.cache = {}
+    ydl = cache.get((kind, folder))
+    if ydl is None:
+        opts = dict(
+            YDL_OPTS[kind],
+            outtmpl=os.path.join(folder, '%(title)s.%(ext)s'),
+            concurrent_fragment_downloads=get_concurrent_fragments(load_config()),
+            progress_hooks=[_abort_if_stopped],
+        )
+        ydl = cache[(kind, folder)] = yt_dlp.YoutubeDL(opts)
+        with _ydl_lock:
+            _ydl_instances.append(ydl)
+    return ydl
+
+
+def close_downloaders() -> None:
+    """Закрывает все YoutubeDL, созданные во время загрузки списка."""
+    with _ydl_lock:
+        for ydl in _ydl_instances:
+            try:
+                ydl.close()
+            except Exception:
+                pass
+        _ydl_instances.clear()
+
+
+def download_videos(urls: list[str], folder: str) -> None:
+    """Скачивает несколько видео YouTube одним вызовом ``YoutubeDL.download``."""
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
+        if get_downloader('video', folder).download(urls):
+            logging.error('Не все видео удалось скачать: %s', ', '.join(urls))
+            safe_print("Не все видео удалось скачать, подробности выше.")
+    except yt_dlp.utils.DownloadCancelled:
+        logging.info('Загрузка прервана: %s', ', '.join(urls))
     except Exception as e:
         logging.error('Ошибка при скачивании YouTube-содержимого: %s', e)
-        print(f"Ошибка при скачивании YouTube-содержимого: {e}")
+        safe_print(f"Ошибка при скачивании YouTube-содержимого: {e}")
+
+
+def download_video(url, folder):
+    download_videos([url], folder)
 
 
 def download_playlist(url, folder):
-    ydl_opts = {
-        'format': 'best',
-        'outtmpl': os.path.join(folder, '%(title)s.%(ext)s'),
-        'merge_output_format': 'mp4',
-        'quiet': False,
-        'no_warnings': True,
-        'yes_playlist': True,
-    }
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
+        get_downloader('playlist', folder).download([url])
+    except yt_dlp.utils.DownloadCancelled:
+        logging.info('Загрузка плейлиста прервана: %s', url)
     except Exception as e:
         logging.error('Ошибка при скачивании плейлиста: %s', e)
-        print(f"Ошибка при скачивании плейлиста: {e}")
+        safe_print(f"Ошибка при скачивании плейлиста: {e}")
+
+
+# Первый <img> с атрибутом src; data-src и подобные не подходят
+_IMG_RE = re.compile(r'<img\b[^>]*?\ssrc\s*=\s*["\']([^"\']+)["\']', re.I)
+
+
+def find_image_url(page: str) -> Optional[str]:
+    """Возвращает адрес первой картинки на HTML-странице или ``None``."""
+    m = _IMG_RE.search(page)
+    if m:
+        return html.unescape(m.group(1))
+    # Нестандартная разметка (например, src без кавычек) разбирается BeautifulSoup
+    from bs4 import BeautifulSoup
+
+    img_tag = BeautifulSoup(page, 'html.parser').find('img', src=True)
+    return img_tag['src'] if img_tag else None
 
 
 def download_pinterest_image(url, folder):
     try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.text, 'html.parser')
-        img_tag = soup.find('img')
-        if img_tag and img_tag.get('src'):
-            img_url = img_tag['src']
-            print(f"Скачиваем изображение: {img_url}")
-            img_data = requests.get(img_url).content
+        response = SESSION.get(url, timeout=10)
+        img_url = find_image_url(response.text)
+        if img_url:
+            safe_print(f"Скачиваем изображение: {img_url}")
             filename = os.path.join(folder, os.path.basename(img_url.split("?")[0]))
-            with open(filename, 'wb') as f:
-                f.write(img_data)
-            print(f"Изображение сохранено как: {filename}")
+            download_file(img_url, filename)
+            safe_print(f"Изображение сохранено как: {filename}")
         else:
-            print("Не удалось найти изображение на странице Pinterest.")
+            safe_print("Не удалось найти изображение на странице Pinterest.")
     except Exception as e:
         logging.error('Ошибка при скачивании изображения с Pinterest: %s', e)
-        print(f"Ошибка при скачивании изображения с Pinterest: {e}")
+        safe_print(f"Ошибка при скачивании изображения с Pinterest: {e}")
 
 
 def download_wb_images(url: str, folder: str) -> None:
@@ -303,15 +673,13 @@ def download_wb_images(url: str, folder: str) -> None:
     try:
         m = re.search(r"/catalog/(\d+)/", url)
         if not m:
-            print("Не удалось извлечь ID товара из ссылки WB.")
+            safe_print("Не удалось извлечь ID товара из ссылки WB.")
             return
         product_id = m.group(1)
 
         vol = int(product_id) // 100000
         part = int(product_id) // 1000
 
-        headers = {"User-Agent": "Mozilla/5.0"}
-
         card_data = None
         host_used = None
         for host in range(100):
@@ -320,7 +688,7 @@ def download_wb_images(url: str, folder: str) -> None:
                 f"{product_id}/info/ru/card.json"
             )
             try:
-                resp = requests.get(card_url, headers=headers, timeout=5)
+                resp = SESSION.get(card_url, timeout=5)
                 if resp.status_code == 200:
                     card_data = resp.json()
                     host_used = host
@@ -329,7 +697,7 @@ def download_wb_images(url: str, folder: str) -> None:
                 continue
 
         if not card_data:
-            print("Не удалось получить данные о товаре WB.")
+            safe_print("Не удалось получить данные о товаре WB.")
             return
 
         name = card_data.get("imt_name", f"wb_{product_id}")
@@ -339,7 +707,7 @@ def download_wb_images(url: str, folder: str) -> None:
 
         count = card_data.get("media", {}).get("photo_count") or 0
         if not count:
-            print("Не удалось определить количество изображений WB.")
+            safe_print("Не удалось определить количество изображений WB.")
             return
 
         host_part = f"https://basket-{host_used:02d}.wbbasket.ru"
@@ -349,52 +717,82 @@ def download_wb_images(url: str, folder: str) -> None:
                 f"{host_part}/vol{vol}/part{part}/{product_id}/images/big/{i}.webp"
             )
             try:
-                img_data = requests.get(img_url, headers=headers, timeout=10).content
                 out_path = os.path.join(product_folder, f"{i}.webp")
-                with open(out_path, "wb") as f:
-                    f.write(img_data)
-                print(f"Скачано: {out_path}")
+                download_file(img_url, out_path)
+                safe_print(f"Скачано: {out_path}")
             except Exception as e:
                 logging.error("Не удалось скачать %s: %s", img_url, e)
     except Exception as e:
         logging.error("Ошибка при скачивании изображений WB: %s", e)
-        print(f"Ошибка при скачивании изображений WB: {e}")
+        safe_print(f"Ошибка при скачивании изображений WB: {e}")
+
+
+# Вид ссылки по домену; поддомены (www., m., ru.) ищутся по суффиксу
+HOST_KINDS = {
+    'youtube.com': 'video',
+    'youtu.be': 'video',
+    'pinterest.com': 'pinterest',
+    'wildberries.ru': 'wb',
+}
+
+
+def url_kind(url: str) -> str:
+    """Возвращает вид ссылки: playlist, video, pinterest, wb или ''."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    while host and host not in HOST_KINDS:
+        host = host.partition('.')[2]
+    kind = HOST_KINDS.get(host, '')
+    if kind == 'video' and host == 'youtube.com' and parsed.path.startswith('/playlist'):
+        return 'playlist'
+    return kind
 
 
 def handle_url(url: str) -> None:
     """Определяет тип ссылки и запускает скачивание."""
-    hostname = urlparse(url).hostname or ""
-    hostname = hostname.lower()
+    kind = url_kind(url)
 
-    if "youtube.com/playlist" in url:
+    if kind == 'playlist':
         logging.info('Скачиваем плейлист: %s', url)
-        print(f"Это плейлист YouTube. Скачиваем всё в: {PLAYLIST_FOLDER}")
+        safe_print(f"Это плейлист YouTube. Скачиваем всё в: {PLAYLIST_FOLDER}")
         download_playlist(url, PLAYLIST_FOLDER)
 
-    elif "youtube.com" in hostname or "youtu.be" in hostname:
+    elif kind == 'video':
         logging.info('Скачиваем видео: %s', url)
-        print(f"Это видео YouTube. Скачиваем в: {VIDEOS_FOLDER}")
+        safe_print(f"Это видео YouTube. Скачиваем в: {VIDEOS_FOLDER}")
         download_video(url, VIDEOS_FOLDER)
 
-    elif "pinterest.com" in hostname:
+    elif kind == 'pinterest':
         logging.info('Скачиваем изображение Pinterest: %s', url)
-        print("Это Pinterest ссылка. Пытаемся скачать...")
+        safe_print("Это Pinterest ссылка. Пытаемся скачать...")
         download_pinterest_image(url, PICTURES_FOLDER)
 
-    elif "wildberries.ru" in hostname:
+    elif kind == 'wb':
         logging.info('Скачиваем товар Wildberries: %s', url)
-        print("Это ссылка Wildberries. Пытаемся скачать изображения...")
+        safe_print("Это ссылка Wildberries. Пытаемся скачать изображения...")
         download_wb_images(url, WB_FOLDER)
 
     else:
         logging.warning('Неизвестная ссылка: %s', url)
-        print("Сайт не поддерживается этим скриптом.")
+        safe_print("Сайт не поддерживается этим скриптом.")
+
+
+def stop_downloads() -> None:
+    """Прерывает текущие загрузки и отменяет ещё не начатые.
+
+    Потоки пула не являются демонами, поэтому без этого интерпретатор
+    после выхода ждал бы, пока скачается весь список.
+    """
+    stop_requested.set()
+    pool = _download_pool
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 def download_all(icon: Optional[pystray.Icon] = None) -> None:
     """Скачивает все ссылки из файла download-list.txt в отдельном потоке."""
     if downloading.is_set():
-        print("Скачивание уже выполняется.")
+        safe_print("Скачивание уже выполняется.")
         return
 
     # —————— Смена иконки на download-solid(Normal-State).ico ——————
@@ -406,22 +804,49 @@ def download_all(icon: Optional[pystray.Icon] = None) -> None:
 
     def worker() -> None:
         try:
-            if not os.path.exists(DOWNLOAD_LIST):
-                print("Файл download-list.txt не найден.")
+            try:
+                with open(DOWNLOAD_LIST, 'r', encoding='utf-8') as f:
+                    urls = [line.strip() for line in f if line.strip()]
+            except FileNotFoundError:
+                safe_print("Файл download-list.txt не найден.")
                 return
 
-            with open(DOWNLOAD_LIST, 'r', encoding='utf-8') as f:
-                urls = [line.strip() for line in f if line.strip()]
-
             if not urls:
-                print("Список ссылок пуст.")
+                safe_print("Список ссылок пуст.")
                 return
 
-            for url in urls:
-                handle_url(url)
-
-            open(DOWNLOAD_LIST, 'w', encoding='utf-8').close()
-            print("Скачивание завершено!")
+            # Загрузки ограничены сетью, поэтому выполняем их параллельно.
+            # Видео делим на пакеты: один вызов yt_dlp на поток, а не на ссылку
+            workers = min(get_max_parallel(load_config()), len(urls))
+            kinds = [url_kind(url) for url in urls]
+            videos = [url for url, kind in zip(urls, kinds) if kind == 'video']
+            others = [url for url, kind in zip(urls, kinds) if kind != 'video']
+            batches = [videos[i::workers] for i in range(min(workers, len(videos)))]
+            if videos:
+                logging.info('Скачиваем видео: %d шт.', len(videos))
+                safe_print(f"Видео YouTube: {len(videos)}. Скачиваем в: {VIDEOS_FOLDER}")
+            def run(job, *args) -> None:
+                # Задачи, до которых очередь дошла после выхода, пропускаем
+                if not stop_requested.is_set():
+                    job(*args)
+
+            global _download_pool
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    _download_pool = pool
+                    for batch in batches:
+                        pool.submit(run, download_videos, batch, VIDEOS_FOLDER)
+                    for url in others:
+                        pool.submit(run, handle_url, url)
+            finally:
+                _download_pool = None
+                close_downloaders()
+
+            if stop_requested.is_set():
+                # Недокачанные ссылки остаются в списке до следующего запуска
+                return
+            remove_processed(set(urls))
+            safe_print("Скачивание завершено!")
             if icon is not None:
                 try:
                     icon.notify('Complete', 'Скачивание завершено')
@@ -442,30 +867,107 @@ def download_all(icon: Optional[pystray.Icon] = None) -> None:
 
 
 
+# Ссылки из download-list.txt для проверки дубликатов за O(1).
+# Файл перечитывается, только если его изменили вне скрипта.
+_url_set: set[str] = set()
+_url_key: tuple | None = None
+_url_lock = threading.Lock()
+# Последняя добавленная ссылка: она может остаться в буфере после загрузки
+_last_added = ''
+
+
+def _list_stat() -> tuple | None:
+    try:
+        st = os.stat(DOWNLOAD_LIST)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _remember_list_stat() -> None:
+    global _url_key
+    _url_key = _list_stat()
+
+
+def known_urls() -> set[str]:
+    """Возвращает множество ссылок из download-list.txt. Вызывать под ``_url_lock``."""
+    global _url_key
+    key = _list_stat()
+    if key != _url_key:
+        _url_set.clear()
+        try:
+            with open(DOWNLOAD_LIST, 'r', encoding='utf-8') as f:
+                _url_set.update(line.strip() for line in f if line.strip())
+        except FileNotFoundError:
+            pass
+        _url_key = key
+    return _url_set
+
+
+def remove_processed(done: set[str]) -> None:
+    """Убирает обработанные ссылки из download-list.txt.
+
+    Ссылки, добавленные во время загрузки, остаются в списке. Файл
+    перезаписывается через временный и ``os.replace``, чтобы сбой не оставил
+    его обрезанным.
+    """
+    with _url_lock:
+        try:
+            with open(DOWNLOAD_LIST, 'r', encoding='utf-8') as f:
+                rest = [line.strip() for line in f if line.strip() and line.strip() not in done]
+        except FileNotFoundError:
+            rest = []
+        try:
+            tmp = DOWNLOAD_LIST + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.writelines(url + '\n' for url in rest)
+            os.replace(tmp, DOWNLOAD_LIST)
+        except OSError as e:
+            logging.error('Не удалось обновить список загрузок: %s', e)
+        _url_set.clear()
+        _url_set.update(rest)
+        _remember_list_stat()
+
+
+def _is_new_url(text: str) -> bool:
+    """Проверяет, что в буфере свежая ссылка, которую ещё не добавляли."""
+    if urlparse(text).scheme not in ('http', 'https') or text == _last_added:
+        return False
+    with _url_lock:
+        return text not in known_urls()
+
+
 def add_link_from_clipboard() -> None:
     """Copy the current selection and append it to download-list.txt."""
-    # Clear clipboard and send Ctrl+C to copy the highlighted text. Waiting
-    # a short moment ensures the clipboard is updated before reading it.
-    pyperclip.copy('')
-    keyboard.press_and_release('ctrl+c')
-    time.sleep(0.2)
+    global _last_added
+    # A freshly copied link is used as is, without simulating Ctrl+C
     url = pyperclip.paste().strip()
+    if not _is_new_url(url):
+        # Clear clipboard and send Ctrl+C to copy the highlighted text, then
+        # poll until the copied text arrives instead of sleeping a fixed time.
+        pyperclip.copy('')
+        keyboard.press_and_release('ctrl+c')
+        deadline = time.monotonic() + CLIPBOARD_TIMEOUT
+        text = pyperclip.paste()
+        while not text and time.monotonic() < deadline:
+            time.sleep(CLIPBOARD_POLL)
+            text = pyperclip.paste()
+        url = text.strip()
     if not url:
         print("Не удалось скопировать ссылку. Возможно, она не выделена.")
         return
 
-    existing = []
-    if os.path.exists(DOWNLOAD_LIST):
-        with open(DOWNLOAD_LIST, 'r', encoding='utf-8') as f:
-            existing = [line.strip() for line in f if line.strip()]
-
-    if url in existing:
-        logging.info('Дубликат ссылки: %s', url)
-        print('Ссылка уже присутствует в списке.')
-        return
+    with _url_lock:
+        if url in known_urls():
+            logging.info('Дубликат ссылки: %s', url)
+            print('Ссылка уже присутствует в списке.')
+            return
 
-    with open(DOWNLOAD_LIST, 'a', encoding='utf-8') as f:
-        f.write(url + '\n')
+        with open(DOWNLOAD_LIST, 'a', encoding='utf-8') as f:
+            f.write(url + '\n')
+        _url_set.add(url)
+        _remember_list_stat()
+    _last_added = url
     print(f"Добавлено в список: {url}")
 
 
@@ -474,8 +976,10 @@ def main() -> None:
     ensure_single_instance()
     config = load_config()
     ensure_directories()
-    if not os.path.exists(DOWNLOAD_LIST):
-        open(DOWNLOAD_LIST, 'a', encoding='utf-8').close()
+    # Режим 'a' создаёт файл при отсутствии и не трогает существующий
+    open(DOWNLOAD_LIST, 'a', encoding='utf-8').close()
+    with _url_lock:
+        known_urls()
 
     add_hotkey = config.get('add_hotkey', DEFAULT_CONFIG['add_hotkey'])
     download_hotkey = config.get('download_hotkey', DEFAULT_CONFIG['download_hotkey'])
@@ -508,6 +1012,7 @@ def main() -> None:
 
     # Выход
     def on_exit(icon, item):
+        stop_downloads()
         icon.stop()
 
     # Открыть список загрузок
@@ -562,7 +1067,7 @@ def main() -> None:
 
     print(f"Значок размещён в трее. Горячие клавиши {add_hotkey} и {download_hotkey} активны.")
     tray_icon.run()
-    hotkey_manager.unregister_all()
+    hotkey_manager.shutdown()
     print('Скрипт завершён.')
 
 if __name__ == '__main__':
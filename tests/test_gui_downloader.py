@@ -0,0 +1,40 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import gui_downloader  # noqa: E402
+
+
+class ProgressRelayTest(unittest.TestCase):
+    def test_hook_from_fragment_thread(self) -> None:
+        # yt_dlp calls hooks from its fragment threads when
+        # concurrent_fragment_downloads is above one
+        seen = []
+        relay = gui_downloader.ProgressRelay(lambda idx, d: seen.append((idx, d['status'])))
+        relay.idx = 3
+        threads = [
+            threading.Thread(target=relay, args=({'status': 'downloading'},))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(seen, [(3, 'downloading')] * 4)
+
+    def test_index_follows_current_download(self) -> None:
+        seen = []
+        relay = gui_downloader.ProgressRelay(lambda idx, d: seen.append(idx))
+        for idx in (0, 5):
+            relay.idx = idx
+            thread = threading.Thread(target=relay, args=({'status': 'downloading'},))
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, [0, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()